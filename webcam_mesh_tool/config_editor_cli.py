@@ -27,7 +27,9 @@ def print_config(config):
         print(f"    x_offset      = {params['x_offset']}")
         print(f"    y_offset      = {params['y_offset']}")
         print(f"    rotation_deg  = {params['rotation_deg']}")
-        print(f"    opacity       = {params['opacity']}\n")
+        print(f"    opacity       = {params['opacity']}")
+        print(f"    gain (B,G,R)  = {params.get('gain', [1.0, 1.0, 1.0])}")
+        print(f"    gain_locked   = {params.get('gain_locked', False)}\n")
 
 def list_webcams(max_index=10):
     print("\n🔍 Scanning for webcams...")
@@ -51,7 +53,9 @@ def modify_camera(config, cam_id):
             "x_offset": 0,
             "y_offset": 0,
             "rotation_deg": 0,
-            "opacity": 1.0
+            "opacity": 1.0,
+            "gain": [1.0, 1.0, 1.0],
+            "gain_locked": False
         }
 
     params = config[cam_id]
@@ -62,12 +66,16 @@ def modify_camera(config, cam_id):
         params["y_offset"] = int(input(f"  y_offset [{params['y_offset']}]: ") or params["y_offset"])
         params["rotation_deg"] = float(input(f"  rotation_deg [{params['rotation_deg']}]: ") or params["rotation_deg"])
         params["opacity"] = float(input(f"  opacity [{params['opacity']}]: ") or params["opacity"])
+        locked = input(f"  gain_locked (y/n) [{'y' if params.get('gain_locked', False) else 'n'}]: ").strip().lower()
+        if locked:
+            params["gain_locked"] = locked.startswith("y")
     except Exception as e:
         print(f"⚠️  Invalid input: {e}")
 
 def show_mesh_preview(config):
     from core.camera_handler import CameraHandler
     from core.mesh_transformer import MeshTransformer
+    from core.gain_compensator import GainCompensator
 
     device_ids = [params["device_id"] for params in config.values()]
     camera_ids = list(config.keys())
@@ -76,12 +84,20 @@ def show_mesh_preview(config):
 
     handler = CameraHandler(device_ids, width=WIDTH, height=HEIGHT)
     transformer = MeshTransformer(width=WIDTH, height=HEIGHT)
+    compensator = GainCompensator(
+        camera_ids,
+        width=WIDTH,
+        height=HEIGHT,
+        initial_gains={cam_id: params["gain"] for cam_id, params in config.items() if "gain" in params},
+        locked={cam_id: params.get("gain_locked", False) for cam_id, params in config.items()}
+    )
     handler.start()
 
     try:
         while True:
             frames = handler.get_frames()
             canvas = np.zeros((HEIGHT, WIDTH, 4), dtype=np.uint8)
+            compensator.update(frames, config)
 
             for i, cam_id in enumerate(camera_ids):
                 params = config[cam_id]
@@ -90,7 +106,8 @@ def show_mesh_preview(config):
                     params["x_offset"],
                     params["y_offset"],
                     params["rotation_deg"],
-                    params["opacity"]
+                    params["opacity"],
+                    lut=compensator.get_lut(cam_id)
                 )
                 alpha = transformed[:, :, 3:] / 255.0
                 for c in range(3):
@@ -106,6 +123,8 @@ def show_mesh_preview(config):
     finally:
         handler.stop()
         cv2.destroyAllWindows()
+        for cam_id in camera_ids:
+            config[cam_id]["gain"] = compensator.get_gains(cam_id)
         print("🛑 Preview closed.")
 
 def run_cli():
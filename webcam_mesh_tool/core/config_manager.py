@@ -27,7 +27,9 @@ class ConfigManager:
             "x_offset": 0,
             "y_offset": 0,
             "rotation_deg": 0,
-            "opacity": 1.0
+            "opacity": 1.0,
+            "gain": [1.0, 1.0, 1.0],
+            "gain_locked": False
         })
 
     def update_param(self, camera_id, param, value):
@@ -0,0 +1,183 @@
+import cv2
+import time
+import numpy as np
+from core.mesh_transformer import MeshTransformer
+
+class GainCompensator:
+    def __init__(self, camera_ids, width=640, height=480, interval=1.0, scale=0.25,
+                 sigma_n=10.0, sigma_g=1.0, min_gain=0.25, max_gain=4.0, saturation_threshold=250,
+                 dark_threshold=5, min_overlap=50, initial_gains=None, locked=None):
+        """
+        Estimate per-camera, per-channel (BGR) gains from overlap regions and
+        cache them as uint8 lookup tables.
+
+        Estimation runs at most once every `interval` seconds on frames
+        downscaled by `scale`; applying a table with cv2.LUT is the only
+        per-frame cost.
+
+        `sigma_g` is the standard deviation of the prior that pulls each gain
+        towards 1.0, relative to `sigma_n`, the expected intensity noise. A
+        smaller `sigma_g` keeps gains closer to 1.0 and only partially removes
+        a brightness step; a larger one matches overlaps more closely but lets
+        unlocked cameras drift together. Solved gains are clamped to
+        [`min_gain`, `max_gain`].
+
+        Overlap pixels with any channel at or above `saturation_threshold`, or
+        at or below `dark_threshold`, are ignored. This also drops the black
+        placeholder frames CameraHandler returns before a camera delivers.
+        A pair of cameras with fewer than `min_overlap` usable pixels (on the
+        downscaled frames) is skipped, and a camera left with no usable pairs
+        keeps its current gain.
+        """
+        self.camera_ids = list(camera_ids)
+        self.interval = interval
+        self.scale = scale
+        self.sigma_n = sigma_n
+        self.sigma_g = sigma_g
+        self.min_gain = min_gain
+        self.max_gain = max_gain
+        self.saturation_threshold = saturation_threshold
+        self.dark_threshold = dark_threshold
+        self.min_overlap = min_overlap
+        self.last_update = 0.0
+
+        self.small_transformer = MeshTransformer(
+            width=max(1, int(width * scale)),
+            height=max(1, int(height * scale))
+        )
+
+        initial_gains = initial_gains or {}
+        locked = locked or {}
+        self.gains = {}
+        self.locked = {}
+        self.luts = {}
+        for cam_id in self.camera_ids:
+            self.gains[cam_id] = np.array(initial_gains.get(cam_id, [1.0, 1.0, 1.0]), dtype=np.float64)
+            self.locked[cam_id] = bool(locked.get(cam_id, False))
+            self.luts[cam_id] = self._build_lut(self.gains[cam_id])
+
+    def update(self, frames, config, force=False):
+        """
+        Re-estimate gains from the given frames if the update interval has elapsed.
+        Returns True if the gains were re-estimated.
+        """
+        now = time.time()
+        if not force and now - self.last_update < self.interval:
+            return False
+        self.last_update = now
+
+        if all(self.locked.values()):
+            return False
+
+        warped = []
+        valid = []
+        for i, cam_id in enumerate(self.camera_ids):
+            params = config[cam_id]
+            small = cv2.resize(frames[i], None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+            placement = (
+                params["x_offset"] * self.scale,
+                params["y_offset"] * self.scale,
+                params["rotation_deg"],
+                1.0
+            )
+            warped.append(self.small_transformer.transform(small, *placement))
+
+            # Warp a white frame the same way; the rotation fill stays black,
+            # so alpha alone cannot tell real pixels from padding.
+            ones = np.full_like(small, 255)
+            valid.append(self.small_transformer.transform(ones, *placement)[:, :, 0] == 255)
+
+        gains = self._solve_gains(warped, valid)
+        if gains is None:
+            return False
+
+        for i, cam_id in enumerate(self.camera_ids):
+            if self.locked[cam_id]:
+                continue
+            self.gains[cam_id] = gains[i]
+            self.luts[cam_id] = self._build_lut(gains[i])
+        return True
+
+    def get_lut(self, camera_id):
+        return self.luts.get(camera_id)
+
+    def get_gains(self, camera_id):
+        return [round(float(g), 4) for g in self.gains[camera_id]]
+
+    def set_gains(self, camera_id, gains):
+        """
+        Manually set the BGR gains for a camera and rebuild its lookup table.
+        """
+        self.gains[camera_id] = np.array(gains, dtype=np.float64)
+        self.luts[camera_id] = self._build_lut(self.gains[camera_id])
+
+    def set_locked(self, camera_id, locked: bool):
+        """
+        Lock or unlock a camera's gains. Locked gains are kept as-is and act
+        as a fixed reference for the remaining cameras.
+        """
+        self.locked[camera_id] = bool(locked)
+
+    def lock_all(self, locked: bool = True):
+        for cam_id in self.camera_ids:
+            self.locked[cam_id] = bool(locked)
+
+    def _solve_gains(self, warped, valid):
+        """
+        Solve for the gains that minimise the intensity difference in every
+        pairwise overlap, with a prior pulling each gain towards 1.0.
+        Returns an (n, 3) array, or None if no pair has enough usable overlap.
+        """
+        n = len(warped)
+        masks = [
+            v & (w[:, :, :3].max(axis=2) < self.saturation_threshold) & (w[:, :, :3].min(axis=2) > self.dark_threshold)
+            for w, v in zip(warped, valid)
+        ]
+
+        counts = np.zeros((n, n), dtype=np.float64)
+        means = np.zeros((n, n, 3), dtype=np.float64)
+        for i in range(n):
+            for j in range(i + 1, n):
+                overlap = masks[i] & masks[j]
+                count = np.count_nonzero(overlap)
+                if count < max(1, self.min_overlap):
+                    continue
+                counts[i, j] = counts[j, i] = count
+                means[i, j] = warped[i][:, :, :3][overlap].mean(axis=0)
+                means[j, i] = warped[j][:, :, :3][overlap].mean(axis=0)
+
+        if not counts.any():
+            return None
+
+        inv_n = 1.0 / self.sigma_n ** 2
+        inv_g = 1.0 / self.sigma_g ** 2
+        gains = np.ones((n, 3), dtype=np.float64)
+
+        for c in range(3):
+            a = np.zeros((n, n), dtype=np.float64)
+            b = np.zeros(n, dtype=np.float64)
+            for i in range(n):
+                for j in range(n):
+                    if i == j or counts[i, j] == 0:
+                        continue
+                    a[i, i] += counts[i, j] * (2 * means[i, j, c] ** 2 * inv_n + inv_g)
+                    a[i, j] -= 2 * counts[i, j] * means[i, j, c] * means[j, i, c] * inv_n
+                    b[i] += counts[i, j] * inv_g
+
+            # Cameras with no overlap, or locked cameras, keep their current gain.
+            for i, cam_id in enumerate(self.camera_ids):
+                if self.locked[cam_id] or a[i, i] == 0:
+                    a[i, :] = 0
+                    a[i, i] = 1
+                    b[i] = self.gains[cam_id][c]
+
+            gains[:, c] = np.linalg.solve(a, b)
+
+        return np.clip(gains, self.min_gain, self.max_gain)
+
+    def _build_lut(self, gains) -> np.ndarray:
+        """
+        Bake BGR gains into a (1, 256, 3) uint8 table for cv2.LUT.
+        """
+        values = np.arange(256, dtype=np.float64).reshape(256, 1) * np.asarray(gains, dtype=np.float64).reshape(1, 3)
+        return np.clip(np.round(values), 0, 255).astype(np.uint8).reshape(1, 256, 3)
@@ -9,10 +9,15 @@ class MeshTransformer:
         self.width = width
         self.height = height
 
-    def transform(self, frame: np.ndarray, x_offset: float, y_offset: float, rotation_deg: float, opacity: float) -> np.ndarray:
+    def transform(self, frame: np.ndarray, x_offset: float, y_offset: float, rotation_deg: float, opacity: float, lut: np.ndarray = None) -> np.ndarray:
         """
-        Apply translation, rotation, and opacity to a single frame.
+        Apply gain compensation, translation, rotation, and opacity to a single frame.
+        If a lookup table is given, it is applied to the frame with cv2.LUT first.
         """
+        # Step 0: Apply cached gain lookup table
+        if lut is not None:
+            frame = cv2.LUT(frame, lut)
+
         # Step 1: Rotate the image
         rotated = self._rotate_image(frame, rotation_deg)
 
@@ -2,13 +2,18 @@ import numpy as np
 from core.camera_handler import CameraHandler
 from core.mesh_transformer import MeshTransformer
 from core.config_manager import ConfigManager
+from core.gain_compensator import GainCompensator
 import cv2
 import os
 
 class WebcamMesh:
-    def __init__(self, config_path: str = "config/default_config.json", width=640, height=480):
+    def __init__(self, config_path: str = "config/default_config.json", width=640, height=480,
+                 gain_compensation=True, gain_interval=1.0, gain_scale=0.25,
+                 gain_sigma_g=1.0, gain_min=0.25, gain_max=4.0):
         """
         Initialize the mesh system using a configuration file.
+        Gains are re-estimated every `gain_interval` seconds on frames downscaled by `gain_scale`;
+        see GainCompensator for the prior (`gain_sigma_g`) and clamp (`gain_min`, `gain_max`).
         """
         self.config_manager = ConfigManager(config_path)
         self.config = self.config_manager.get_config()
@@ -22,6 +27,20 @@ class WebcamMesh:
 
         self.camera_ids = list(self.config.keys())
 
+        self.gain_compensation = gain_compensation
+        self.gain_compensator = GainCompensator(
+            self.camera_ids,
+            width=self.width,
+            height=self.height,
+            interval=gain_interval,
+            scale=gain_scale,
+            sigma_g=gain_sigma_g,
+            min_gain=gain_min,
+            max_gain=gain_max,
+            initial_gains={cam_id: params["gain"] for cam_id, params in self.config.items() if "gain" in params},
+            locked={cam_id: params.get("gain_locked", False) for cam_id, params in self.config.items()}
+        )
+
         self.camera_handler.start()
 
     def get_composite_frame(self) -> np.ndarray:
@@ -31,6 +50,9 @@ class WebcamMesh:
         frames = self.camera_handler.get_frames()
         canvas = np.zeros((self.height, self.width, 4), dtype=np.uint8)
 
+        if self.gain_compensation:
+            self.gain_compensator.update(frames, self.config)
+
         for i, camera_id in enumerate(self.camera_ids):
             params = self.config[camera_id]
             transformed = self.transformer.transform(
@@ -38,7 +60,8 @@ class WebcamMesh:
                 params["x_offset"],
                 params["y_offset"],
                 params["rotation_deg"],
-                params["opacity"]
+                params["opacity"],
+                lut=self.gain_compensator.get_lut(camera_id) if self.gain_compensation else None
             )
             canvas = self._alpha_blend(canvas, transformed)
 
@@ -61,6 +84,12 @@ class WebcamMesh:
 
         return base
 
+    def set_gain_locked(self, camera_id, locked: bool):
+        """
+        Lock or unlock the live gain estimate for a camera.
+        """
+        self.gain_compensator.set_locked(camera_id, locked)
+
     def export_still(self, output_path="output/final_composite_feed/still.png"):
         """
         Save the current composite frame as a PNG.
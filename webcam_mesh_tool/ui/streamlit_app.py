@@ -42,7 +42,9 @@ def launch_ui():
                     "x_offset": 0,
                     "y_offset": 0,
                     "rotation_deg": 0,
-                    "opacity": 1.0
+                    "opacity": 1.0,
+                    "gain": [1.0, 1.0, 1.0],
+                    "gain_locked": False
                 }
 
             os.makedirs("config", exist_ok=True)
@@ -75,14 +77,20 @@ def launch_ui():
                 y = st.slider(f"{cam_id} Y Offset", -300, 300, value=st.session_state.config_manager.get_camera_params(cam_id)["y_offset"])
                 rot = st.slider(f"{cam_id} Rotation", -180, 180, value=st.session_state.config_manager.get_camera_params(cam_id)["rotation_deg"])
                 alpha = st.slider(f"{cam_id} Opacity", 0.0, 1.0, value=st.session_state.config_manager.get_camera_params(cam_id)["opacity"])
+                gain_locked = st.checkbox(f"{cam_id} Lock Gains", value=st.session_state.config_manager.get_camera_params(cam_id).get("gain_locked", False))
+                st.caption(f"Gains (B, G, R): {st.session_state.mesh.gain_compensator.get_gains(cam_id)}")
 
                 st.session_state.config_manager.update_param(cam_id, "x_offset", x)
                 st.session_state.config_manager.update_param(cam_id, "y_offset", y)
                 st.session_state.config_manager.update_param(cam_id, "rotation_deg", rot)
                 st.session_state.config_manager.update_param(cam_id, "opacity", alpha)
+                st.session_state.config_manager.update_param(cam_id, "gain_locked", gain_locked)
+                st.session_state.mesh.set_gain_locked(cam_id, gain_locked)
                 updated = True
 
         if st.sidebar.button("💾 Save Config"):
+            for cam_id in st.session_state.config_manager.get_camera_ids():
+                st.session_state.config_manager.update_param(cam_id, "gain", st.session_state.mesh.gain_compensator.get_gains(cam_id))
             st.session_state.config_manager.save(CONFIG_PATH)
 
         st.subheader("📷 Composite View")